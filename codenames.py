@@ -17,13 +17,13 @@ History:
 Done:
 - Add the generated code names into the file with the list of used code names.
 - Output a list of codenames instead of just one code name (option multiple) with maximum of 25.
+- Batch size: generate the requested number of code names at once.
 
 Todo:
 - Option to give this output in different formats: CSV, JSON, plain text.
 - Logging and Export: save generated code names into a specified file, with an option for appending or overwriting.
 - Case customization: options for all upper case, all lowercase or title case.
 - Word Filtering: add a filter to exclude words, either based on scpecific words, or based on length.
-- Batch size: set a number of code names to generate at once.
 
 """
 
@@ -31,6 +31,24 @@ import random
 import requests
 import json
 import argparse
+import os
+import time
+import hashlib
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson as _json  # Faster parser for the large word lists, when installed
+except ImportError:
+    _json = json
+
+# Local cache for the fetched JSON word lists
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "codenames")
+CACHE_TTL = 7 * 24 * 60 * 60  # one week, in seconds
+
+# Shared session so both word list downloads reuse pooled keep-alive connections
+_session = requests.Session()
 
 def load_words_from_file(file_path, encoding="utf-8"):
     """
@@ -38,7 +56,8 @@ def load_words_from_file(file_path, encoding="utf-8"):
     """
     try:
         with open(file_path, 'r', encoding=encoding) as file:
-            return [line.strip() for line in file if line.strip()]
+            text = file.read()
+        return [line for line in map(str.strip, text.splitlines()) if line]
     except FileNotFoundError:
         print(f"File {file_path} not found.")
         return []
@@ -46,19 +65,96 @@ def load_words_from_file(file_path, encoding="utf-8"):
         print(f"Error reading file {file_path} with encoding {encoding}: {e}")
         return []
 
-def append_to_used_code_names_file(code_name, file_path):
+def append_to_used_code_names_file(code_names, file):
     """
-    Append the generated code name(s) to the list of used code names file.
+    Append the generated code name(s) to an open used code names file.
+    """
+    for code_name in code_names:
+        file.write(f"{code_name}\n")
+
+def _cache_paths(url):
+    """
+    Return the paths of the cached JSON file and its ETag sidecar for a given URL.
+    """
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{digest}.json")
+    return cache_path, cache_path + ".etag"
+
+def _write_atomically(path, content):
+    """
+    Write bytes to a file through a temporary file so a partial write never replaces the cache.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+def _read_cache(cache_path):
+    """
+    Load the cached JSON data, or return None if it is missing or unreadable.
     """
     try:
-        with open(file_path, 'a', encoding="utf-8") as file:
-            file.write(f"{code_name}\n")
-    except IOError as e:
-        print(f"Error writing to file {file_path}: {e}")
+        with open(cache_path, 'rb') as file:
+            return _json.loads(file.read())
+    except (OSError, ValueError):
+        return None
+
+@functools.lru_cache(maxsize=8)
+def _fetch_json(url):
+    """
+    Fetch JSON data from a URL, using the on-disk cache when it is fresh and a
+    conditional GET (If-None-Match) when it has expired.
+    """
+    cache_path, etag_path = _cache_paths(url)
+
+    data = _read_cache(cache_path)
+    if data is not None and time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+        return data
+
+    headers = {}
+    if data is not None:
+        try:
+            with open(etag_path, 'r', encoding="utf-8") as file:
+                headers["If-None-Match"] = file.read().strip()
+        except OSError:
+            pass
+
+    try:
+        response = _session.get(url, headers=headers, timeout=5)
+        response.raise_for_status()  # Check for request errors
+    except requests.RequestException:
+        if data is not None:
+            return data  # Fall back to the stale cache when offline
+        raise
+
+    if response.status_code == 304 and data is not None:
+        try:
+            os.utime(cache_path)  # Still valid, restart the TTL
+        except OSError as e:
+            print(f"Error refreshing cache for {url}: {e}")
+        return data
+
+    data = _json.loads(response.content)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_atomically(cache_path, response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            _write_atomically(etag_path, etag.encode("utf-8"))
+        elif os.path.exists(etag_path):
+            os.remove(etag_path)  # Do not send a stale ETag for the new content
+    except OSError as e:
+        print(f"Error writing cache for {url}: {e}")
+    return data
 
 def fetch_words_from_url(url, key):
     """
     Fetch words from a JSON URL for MIT word lists where words are stored under a specific key.
+    The JSON is cached locally in CACHE_DIR so repeated runs do not hit the network.
     
     Args:
         url (str): The URL to fetch the JSON data from.
@@ -68,12 +164,9 @@ def fetch_words_from_url(url, key):
         list: A list of words fetched from the JSON data.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Check for request errors
-        
         # Parse JSON and extract words under the given key
-        data = response.json()
-        words = data.get(key, [])
+        data = _fetch_json(url)
+        words = list(data.get(key, []))
         
         if not words:
             print(f"No words found under key '{key}' in the JSON file.")
@@ -99,18 +192,27 @@ def get_words(adjective_file=None, noun_file=None):
         noun_file (str): Path to local nouns file (optional).
         
     Returns:
-        tuple: A tuple containing two lists: adjectives and nouns.
+        tuple: A tuple containing two frozensets of uppercase words: adjectives and nouns.
     """
-    if adjective_file:
-        adjectives = load_words_from_file(adjective_file)
+    if not adjective_file and not noun_file:
+        # Fetch both lists from their URLs concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            adjectives, nouns = executor.map(fetch_words_from_url, [adjectives_url, nouns_url], ["adjs", "nouns"])
     else:
-        adjectives = fetch_words_from_url(adjectives_url, "adjs")  # Fetch from URL
+        if adjective_file:
+            adjectives = load_words_from_file(adjective_file)
+        else:
+            adjectives = fetch_words_from_url(adjectives_url, "adjs")  # Fetch from URL
 
-    if noun_file:
-        nouns = load_words_from_file(noun_file)
-    else:
-        nouns = fetch_words_from_url(nouns_url, "nouns")  # Fetch from URL
+        if noun_file:
+            nouns = load_words_from_file(noun_file)
+        else:
+            nouns = fetch_words_from_url(nouns_url, "nouns")  # Fetch from URL
 
+    # Uppercase once here, as code names are output, so the generator can filter
+    # with a set difference and build names without converting them.
+    adjectives = frozenset(word.upper() for word in adjectives)
+    nouns = frozenset(word.upper() for word in nouns)
     return adjectives, nouns
 
 def load_used_code_names(file_path):
@@ -121,41 +223,50 @@ def load_used_code_names(file_path):
         file_path (str): Path to the TXT file containing used code names.
         
     Returns:
-        tuple: Two sets containing used adjectives and used nouns.
+        tuple: Two sets containing used adjectives and used nouns, uppercased.
     """
     used_adjectives = set()
     used_nouns = set()
     try:
         with open(file_path, 'r') as file:
             for line in file:
-                words = line.strip().split()
+                words = line.upper().split()
                 if len(words) == 2:
                     adj, noun = words
-                    used_adjectives.add(adj.lower())
-                    used_nouns.add(noun.lower())
+                    used_adjectives.add(adj)
+                    used_nouns.add(noun)
     except FileNotFoundError:
         print(f"File {file_path} not found.")
     
     return used_adjectives, used_nouns
 
+def _pop_random(pool):
+    """
+    Remove and return a random word from the pool by swapping it with the last word
+    and popping it, so removal is O(1).
+    """
+    i = random.randrange(len(pool))
+    pool[i], pool[-1] = pool[-1], pool[i]
+    return pool.pop()
+
 def generate_unique_code_name(adjectives, nouns, used_adjectives, used_nouns, mcount=1):
     """Generate unique code names with the possibility of them being multiple, up to 25."""
+    # Filter once for the whole batch, then draw from the pools without replacement
+    available_adjectives = list(adjectives - used_adjectives)
+    available_nouns = list(nouns - used_nouns)
+    count = min(mcount, len(available_adjectives), len(available_nouns))
+    if count < mcount:
+        print(f"Error: Only {count} unused adjective and noun pair(s) left.")
+
     generated_names = []
-    for _ in range(mcount):
-        code_name = None
-        while not code_name:
-            adj = random.choice(adjectives)
-            noun = random.choice(nouns)
-            potential_name = f"{adj} {noun}".upper()
-            if adj.lower() not in used_adjectives and noun.lower() not in used_nouns:
-                used_adjectives.add(adj.lower())
-                used_nouns.add(noun.lower())
-                generated_names.append(potential_name)
-                break
+    for _ in range(count):
+        adj = _pop_random(available_adjectives)
+        noun = _pop_random(available_nouns)
+        used_adjectives.add(adj)
+        used_nouns.add(noun)
+        generated_names.append(f"{adj} {noun}")
     return generated_names
 
-    return None
-
 # Main function to run the code name generator
 def main(adjective_file=None, noun_file=None, used_code_names_file=None, append=False, mcount=1):
     adjectives, nouns = get_words(adjective_file, noun_file)
@@ -172,9 +283,13 @@ def main(adjective_file=None, noun_file=None, used_code_names_file=None, append=
     print("Generated code name(s):")
     for code_name in code_names:
         print(code_name)
-        # Append each generated code name to the file if append option is set
-        if append and used_code_names_file:
-            append_to_used_code_names_file(code_name, used_code_names_file)
+    # Append the generated code names to the file if append option is set
+    if append and used_code_names_file:
+        try:
+            with open(used_code_names_file, 'a', encoding="utf-8") as file:
+                append_to_used_code_names_file(code_names, file)
+        except IOError as e:
+            print(f"Error writing to file {used_code_names_file}: {e}")
 
 # Argument parser to handle command-line options
 if __name__ == "__main__":